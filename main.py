@@ -1,34 +1,112 @@
 
 
+import calendar
 import csv
+import ctypes
+import io
 import json
+import math
 import os
 import shutil
+import sys
 import time
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from importlib import import_module
+from itertools import accumulate, islice
+from typing import List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# Optional packages (numpy: faster reports on large files, pyarrow:
+# multithreaded CSV parsing) are imported on first use, see _optional().
+_optional_modules = {}
 
 
 # Configuration & Helpers
 
 DATA_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "expenses.csv")
 BACKUP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backups")
-CSV_HEADER = ["Date", "Category", "Amount", "Description"]
-CATEGORIES = ["Food", "Transport", "Entertainment", "Shopping", "Bills", "Health", "Education", "Other"]
+CSV_HEADER = ["Id", "Date", "Category", "Amount", "Description"]
+LEGACY_HEADER = ["Date", "Category", "Amount", "Description"]  # before the Id column
+# Row count from which the numpy paths are used. Their arrays/group codes are
+# built once per load (about the cost of one Python loop) and then reused,
+# so repeat reports and searches on the cached data are far cheaper.
+VECTORIZE_MIN_ROWS = 10000
+ARROW_MIN_BYTES = 1 << 20  # smaller files parse faster with the csv module
+CATEGORIES_TUPLE = ("Food", "Transport", "Entertainment", "Shopping", "Bills", "Health", "Education", "Other")
+CATEGORIES_LC = {c.lower(): c for c in CATEGORIES_TUPLE}  # case-insensitive lookup
+
+
+_data_ready = False  # set once the data file is known to exist
+
+
+def _optional(name: str):
+    # Imported only when a large-file path needs it, so startup stays cheap;
+    # None if the package is not installed.
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
 
 
 def ensure_data_file():
+    global _data_ready
+    if _data_ready:
+        return
     os.makedirs(os.path.dirname(DATA_FILENAME), exist_ok=True)
     if not os.path.exists(DATA_FILENAME):
         with open(DATA_FILENAME, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(CSV_HEADER)
+            f.write(",".join(CSV_HEADER) + "\n")
+    _data_ready = True  # the migration's save_expenses must not re-enter here
+    try:
+        with open(DATA_FILENAME, "r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header[:1] == LEGACY_HEADER[:1]:
+            _migrate_legacy_file()
+    except Exception as e:
+        _data_ready = False  # check again on the next call
+        print("Error loading data:", e)
+
+
+_CLEAR = "\x1b[2J\x1b[H"  # ANSI: erase display, cursor home
+
+
+def _detect_clear_mode() -> str:
+    # Decided once at import: "ansi", "cls" (old Windows consoles) or "none".
+    if sys.stdout is None or not sys.stdout.isatty():
+        return "none"  # piped output: nothing to clear
+    if os.name != "nt":
+        return "ansi"
+    try:
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)) and \
+                kernel32.SetConsoleMode(handle, mode.value | 0x0004):  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            return "ansi"
+    except Exception:
+        pass
+    return "cls"
+
+
+_CLEAR_MODE = _detect_clear_mode()
 
 
 def clear_screen():
-    os.system("cls" if os.name == "nt" else "clear")
+    if _CLEAR_MODE == "ansi":
+        sys.stdout.write(_CLEAR)
+        sys.stdout.flush()
+    elif _CLEAR_MODE == "cls":
+        os.system("cls")
 
 
 def pause():
@@ -44,18 +122,20 @@ class Expense:
     category: str
     date: str  # YYYY-MM-DD
     description: str = ""
+    id: int = 0  # stable row id, assigned when first written
 
-    def to_row(self) -> List[str]:
-        return [self.date, self.category, f"{self.amount:.2f}", self.description]
+    def to_row(self) -> Tuple[str, str, str, str, str]:
+        return (str(self.id), self.date, self.category, f"{self.amount:.2f}", self.description)
 
     @classmethod
     def from_row(cls, row: List[str]):
-        # row: [date, category, amount, description]
-        date = row[0]
-        category = row[1]
-        amount = float(row[2])
-        description = row[3] if len(row) > 3 else ""
-        return cls(amount=amount, category=category, date=date, description=description)
+        # row: [id, date, category, amount, description]
+        expense_id = int(row[0])
+        date = row[1]
+        category = row[2]
+        amount = float(row[3])
+        description = row[4] if len(row) > 4 else ""
+        return cls(amount=amount, category=category, date=date, description=description, id=expense_id)
 
     def __str__(self):
         return f"{self.date} | {self.category}: ₹{self.amount:.2f} - {self.description}"
@@ -64,55 +144,427 @@ class Expense:
 
 # File Operations
 
+# Parsed data is reused until the file changes on disk (mtime or size).
+# "positions" maps id -> list index; "offsets" maps id -> (byte offset,
+# byte length) of the row on disk, when known, for in-place edits;
+# "max_id" is the largest id in "data".
+_cache = {"stamp": None, "data": None, "positions": None, "offsets": None, "max_id": 0}
+_columns_cache = {"stamp": None, "data": None}
+
+
+def _file_stamp():
+    try:
+        st = os.stat(DATA_FILENAME)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_rows() -> List[List[str]]:
+    # One read and plain splits; only quoted fields need the csv module.
+    with open(DATA_FILENAME, "rb") as f:
+        data = f.read()
+    text = data.decode("utf-8")
+    if b'"' in data:
+        return list(csv.reader(io.StringIO(text, newline="")))[1:]
+    lines = text.split("\n")
+    return [line.rstrip("\r").split(",", 4) for line in lines[1:] if line]
+
+
+def _migrate_legacy_file():
+    # Files from before the Id column: number the rows 1..N and rewrite once.
+    with open(DATA_FILENAME, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # skip header
+        expenses = []
+        for row in reader:
+            if len(row) < 3:
+                continue
+            try:
+                expenses.append(Expense.from_row([str(len(expenses) + 1)] + row))
+            except ValueError:
+                continue
+    if not save_expenses(expenses):
+        raise OSError("could not rewrite the data file with ids")
+
+
 def load_expenses() -> List[Expense]:
     ensure_data_file()
+    stamp = _file_stamp()
+    if stamp is not None and stamp == _cache["stamp"]:
+        return _cache["data"]
     expenses = []
     try:
-        with open(DATA_FILENAME, "r", newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            for i, row in enumerate(reader):
-                if i == 0:
-                    continue  # skip header
-                if not row or len(row) < 3:
-                    continue
-                try:
-                    expenses.append(Expense.from_row(row))
-                except Exception:
-                    continue
+        for row in _read_rows():
+            if len(row) < 4:
+                continue
+            try:
+                expenses.append(Expense.from_row(row))
+            except Exception:
+                continue
     except Exception as e:
         print("Error loading data:", e)
+        return expenses
+    # Row offsets are only needed for in-place edits; see _row_offsets().
+    _cache.update(stamp=stamp, data=expenses, positions=None, offsets=None,
+                  max_id=max((e.id for e in expenses), default=0))
     return expenses
 
 
-def save_expenses(expenses: List[Expense]):
+def _row_offsets(expenses: List[Expense]) -> dict:
+    # id -> (byte offset, length) of each row, for the cached expenses. Built
+    # on the first edit rather than on every load; empty when the offsets
+    # can't be tracked or some row was skipped while loading.
+    with open(DATA_FILENAME, "rb") as f:
+        data = f.read()
+    if b'"' in data or b"\r" in data or not data.isascii():
+        return {}
+    lengths = list(map(len, data.decode("ascii").split("\n")))
+    starts = accumulate(map((1).__add__, lengths), initial=0)
+    offsets = [t for t in islice(zip(starts, lengths), 1, None) if t[1]]
+    if len(offsets) != len(expenses):
+        return {}
+    return dict(zip((e.id for e in expenses), offsets))
+
+
+def _last_row_id():
+    # Id of the file's last row, read from its tail. Rows are only ever
+    # appended with increasing ids, so this is the largest id in use.
+    # None when the tail can't be parsed (header only, quoted field, ...).
+    with open(DATA_FILENAME, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - 4096)
+        f.seek(start)
+        lines = f.read().split(b"\n")
+    for n in range(len(lines) - 1, -1, -1):
+        line = lines[n].strip()
+        if not line:
+            continue
+        if n == 0 and start > 0:
+            return None  # may be a partial line
+        field = line.split(b",", 1)[0]
+        return int(field) if field.isdigit() else None
+    return None
+
+
+def _last_id_path() -> str:
+    return os.path.splitext(DATA_FILENAME)[0] + ".lastid"
+
+
+def _read_last_id() -> int:
+    # Highest id ever handed out. Kept next to the CSV and never lowered, so
+    # deleting the last row doesn't make its id available again.
+    try:
+        with open(_last_id_path(), "r", encoding="ascii") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _record_last_id(expense_id: int):
+    if expense_id <= _read_last_id():
+        return
+    try:
+        with open(_last_id_path(), "w", encoding="ascii") as f:
+            f.write(str(expense_id))
+    except OSError as e:
+        print("Could not save last id:", e)
+
+
+def next_expense_id() -> int:
+    ensure_data_file()
+    if _cache["stamp"] is not None and _cache["stamp"] == _file_stamp():
+        last = _cache["max_id"]
+    else:
+        try:
+            last = _last_row_id()
+        except FileNotFoundError:
+            last = 0  # deleted at runtime; the next append recreates it
+        except OSError:
+            last = None
+        if last is None:
+            last = max((e.id for e in load_expenses()), default=0)
+    return max(last, _read_last_id()) + 1
+
+
+def expense_position(expenses: List[Expense], expense_id: int):
+    # List index of the expense with this id, or None.
+    if _cache["data"] is not expenses or _cache["positions"] is None:
+        positions = {e.id: i for i, e in enumerate(expenses)}
+        if _cache["data"] is not expenses:
+            return positions.get(expense_id)
+        _cache["positions"] = positions
+    return _cache["positions"].get(expense_id)
+
+
+def _empty_columns() -> dict:
+    return {"id": [], "date": [], "category": [], "amount": array("d"), "description": []}
+
+
+def _read_columns_csv() -> dict:
+    cols = _empty_columns()
+    ids, dates, categories, amounts, descriptions = (
+        cols["id"], cols["date"], cols["category"], cols["amount"], cols["description"])
+    for row in _read_rows():
+        if len(row) < 4:
+            continue
+        try:
+            expense_id, amount = int(row[0]), float(row[3])
+        except ValueError:
+            continue
+        ids.append(expense_id)
+        dates.append(row[1])
+        categories.append(row[2])
+        amounts.append(amount)
+        descriptions.append(row[4] if len(row) > 4 else "")
+    return cols
+
+
+def _read_columns_arrow() -> dict:
+    # Raises on any malformed row; the caller then falls back to the csv module.
+    pa, pacsv = _optional("pyarrow"), _optional("pyarrow.csv")
+    convert = pacsv.ConvertOptions(
+        column_types={"Id": pa.int64(), "Date": pa.string(), "Category": pa.string(),
+                      "Amount": pa.float64(), "Description": pa.string()},
+        strings_can_be_null=False)
+    table = pacsv.read_csv(DATA_FILENAME, convert_options=convert)
+    amount_col = table.column("Amount")
+    if amount_col.null_count or table.column("Id").null_count:
+        raise ValueError("missing values")
+    amounts = array("d")
+    amounts.frombytes(amount_col.to_numpy().tobytes())
+    return {"id": table.column("Id").to_pylist(),
+            "date": table.column("Date").to_pylist(),
+            "category": table.column("Category").to_pylist(),
+            "amount": amounts,
+            "description": table.column("Description").to_pylist()}
+
+
+def load_expenses_columnar() -> dict:
+    # Column-per-field layout for the reporting paths; no Expense per row.
+    ensure_data_file()
+    stamp = _file_stamp()
+    if stamp is not None and stamp == _columns_cache["stamp"]:
+        return _columns_cache["data"]
+    cols = None
+    if stamp is not None and stamp[1] >= ARROW_MIN_BYTES and _optional("pyarrow.csv") is not None:
+        try:
+            cols = _read_columns_arrow()
+        except Exception:
+            cols = None
+    if cols is None:
+        try:
+            cols = _read_columns_csv()
+        except Exception as e:
+            print("Error loading data:", e)
+            return _empty_columns()
+    # Lowercased once here so searches don't redo it per row.
+    cols["category_lc"] = [c.lower() for c in cols["category"]]
+    cols["description_lc"] = [d.lower() for d in cols["description"]]
+    dates = cols["date"]
+    cols["dates_sorted"] = all(a <= b for a, b in zip(dates, dates[1:]))
+    _columns_cache["stamp"], _columns_cache["data"] = stamp, cols
+    return cols
+
+
+def _format_row(row: Tuple[str, ...]) -> str:
+    # Plain join is enough unless some field needs CSV quoting: an extra
+    # comma, a quote or a line break anywhere in the joined line.
+    line = ",".join(row)
+    if line.count(",") != len(row) - 1 or '"' in line or "\n" in line or "\r" in line:
+        buf = io.StringIO()
+        # The terminator must contain \r\n so embedded line breaks get quoted.
+        csv.writer(buf, lineterminator="\r\n").writerow(row)
+        return buf.getvalue()[:-2]
+    return line
+
+
+def save_expenses(expenses: List[Expense]) -> bool:
     ensure_data_file()
+    # We know the file is about to change; don't rely on mtime/size alone.
+    _columns_cache["stamp"] = None
+    # Write a temp file and swap it in, so a crash never leaves half a CSV.
+    tmp = DATA_FILENAME + ".tmp"
     try:
-        with open(DATA_FILENAME, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(CSV_HEADER)
-            for e in expenses:
-                writer.writerow(e.to_row())
+        rows = [",".join(e.to_row()) for e in expenses]
+        body = "\n".join(rows)
+        # One check over the whole body; only if some field needs quoting
+        # are the rows formatted one by one.
+        if body.count(",") != 4 * len(rows) or body.count("\n") != max(len(rows) - 1, 0) \
+                or '"' in body or "\r" in body:
+            rows = [_format_row(e.to_row()) for e in expenses]
+            body = "\n".join(rows)
+        with open(tmp, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+            f.write(",".join(CSV_HEADER) + "\n")
+            if rows:
+                f.write(body)
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, DATA_FILENAME)
     except Exception as e:
+        _cache["stamp"] = None
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
         print("Error saving data:", e)
+        return False
+    offsets = None
+    if body.isascii():  # byte length == str length
+        lengths = list(map(len, rows))
+        starts = accumulate(map((1).__add__, lengths), initial=len(",".join(CSV_HEADER)) + 1)
+        offsets = dict(zip((e.id for e in expenses), zip(starts, lengths)))
+    _cache.update(stamp=_file_stamp(), data=expenses, positions=None, offsets=offsets,
+                  max_id=max((e.id for e in expenses), default=0))
+    _write_totals(_totals_of(expenses))
+    return True
 
 
 def append_expense(expense: Expense):
     ensure_data_file()
+    _columns_cache["stamp"] = None
+    if not expense.id:
+        expense.id = next_expense_id()
+    before = _file_stamp()
+    cached = _cache["stamp"] is not None and _cache["stamp"] == before
+    line = _format_row(expense.to_row()).encode("utf-8")
     try:
-        with open(DATA_FILENAME, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(expense.to_row())
+        with open(DATA_FILENAME, "ab") as f:
+            if f.tell() == 0:  # file deleted or emptied since ensure_data_file
+                f.write(",".join(CSV_HEADER).encode("utf-8") + b"\n")
+            start = f.tell()
+            f.write(line + b"\n")
     except Exception as e:
+        _cache["stamp"] = None
         print("Error appending expense:", e)
+        return
+    _record_last_id(expense.id)
+    if cached:
+        _cache["data"].append(expense)
+        if _cache["positions"] is not None:
+            _cache["positions"][expense.id] = len(_cache["data"]) - 1
+        if _cache["offsets"] is not None:
+            _cache["offsets"][expense.id] = (start, len(line))
+        _cache["max_id"] = max(_cache["max_id"], expense.id)
+        _cache["stamp"] = _file_stamp()
+    _update_totals(expense, before)
+
+
+def update_expense(expenses: List[Expense], expense: Expense) -> bool:
+    # Rewrite just this row in place when its on-disk length is unchanged;
+    # anything else falls back to rewriting the whole file.
+    ensure_data_file()
+    _columns_cache["stamp"] = None
+    stamp = _file_stamp()
+    offsets = None
+    if _cache["data"] is expenses and _cache["stamp"] == stamp:
+        if _cache["offsets"] is None:
+            try:
+                _cache["offsets"] = _row_offsets(expenses)
+            except Exception:
+                _cache["offsets"] = {}
+        offsets = _cache["offsets"]
+    line = _format_row(expense.to_row()).encode("utf-8")
+    if offsets is None or offsets.get(expense.id, (0, -1))[1] != len(line):
+        return save_expenses(expenses)
+    try:
+        with open(DATA_FILENAME, "r+b") as f:
+            f.seek(offsets[expense.id][0])
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception as e:
+        _cache["stamp"] = None
+        print("Error saving data:", e)
+        return False
+    _cache["stamp"] = _file_stamp()
+    _write_totals(_totals_of(expenses))
+    return True
+
+
+class BulkAppender:
+    # Keeps one buffered handle open for many appends; flushed once on exit.
+    def __enter__(self):
+        ensure_data_file()
+        _columns_cache["stamp"] = None
+        self.next_id = next_expense_id()
+        self.f = open(DATA_FILENAME, "a", newline="", encoding="utf-8", buffering=1 << 20)
+        if self.f.tell() == 0:  # file deleted or emptied since ensure_data_file
+            self.f.write(",".join(CSV_HEADER) + "\n")
+        self.count = 0
+        return self
+
+    def add(self, expense: Expense):
+        expense.id = self.next_id
+        self.next_id += 1
+        self.f.write(_format_row(expense.to_row()) + "\n")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.f.flush()
+            os.fsync(self.f.fileno())
+        finally:
+            self.f.close()
+            if self.count:
+                _record_last_id(self.next_id - 1)
+        return False
+
+
+def import_csv(path: str):
+    out = None
+    try:
+        with open(path, "r", newline="", encoding="utf-8") as src, BulkAppender() as out:
+            reader = csv.reader(src)
+            header = next(reader, [])
+            has_id = header[:1] == CSV_HEADER[:1]
+            skipped = 0
+            for row in reader:
+                if has_id:
+                    row = row[1:]  # imported rows always get fresh ids from the appender
+                # Same checks as the add/edit flows.
+                if len(row) < 3 or not valid_date(row[0]) or not valid_amount(row[2]):
+                    skipped += 1
+                    continue
+                category = CATEGORIES_LC.get(row[1].strip().lower(), "Other")
+                out.add(Expense(amount=float(row[2]), category=category, date=row[0],
+                                description=row[3] if len(row) > 3 else ""))
+        print(f"Imported {out.count} expense(s) from: {path}")
+        if skipped:
+            print(f"Skipped {skipped} invalid row(s).")
+    except Exception as e:
+        # Rows added before the failure are already flushed to the data file.
+        print(f"Import failed after {out.count if out else 0} expense(s):", e)
+    return out.count if out else 0
 
 
 def export_json(path=None):
     if path is None:
         path = DATA_FILENAME.replace(".csv", ".json")
-    exps = load_expenses()
+    ensure_data_file()
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump([asdict(e) for e in exps], f, indent=2, ensure_ascii=False)
+        # Streamed row by row straight from the CSV, so memory stays flat.
+        with open(path, "w", encoding="utf-8") as out, \
+                open(DATA_FILENAME, "r", newline="", encoding="utf-8") as src:
+            reader = csv.reader(src)
+            next(reader, None)  # skip header
+            out.write("[")
+            sep = "\n  "
+            for row in reader:
+                if len(row) < 4:
+                    continue
+                try:
+                    expense_id, amount = int(row[0]), float(row[3])
+                except ValueError:
+                    continue
+                out.write(sep)
+                out.write(json.dumps({"amount": amount, "category": row[2], "date": row[1],
+                                      "description": row[4] if len(row) > 4 else "",
+                                      "id": expense_id},
+                                     ensure_ascii=False))
+                sep = ",\n  "
+            out.write("\n]\n")
         print(f"Exported JSON to: {path}")
     except Exception as e:
         print("Export JSON failed:", e)
@@ -121,27 +573,59 @@ def export_json(path=None):
 
 # Backup & Restore
 
+_FICLONE = 0x40049409  # Linux ioctl: share the source file's extents (reflink)
+
+
+def _fast_copy(src: str, dst: str):
+    # Copy-on-write clone where the filesystem supports it (btrfs, XFS, APFS),
+    # so no data is copied; anything else falls back to a normal copy.
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copymode(src, dst)
+            return
+        except OSError:
+            pass
+    elif sys.platform == "darwin":
+        tmp = dst + ".clone"
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.clonefile(os.fsencode(src), os.fsencode(tmp), 0) == 0:
+                os.replace(tmp, dst)
+                return
+        except (OSError, AttributeError):
+            pass
+    shutil.copy(src, dst)
+
+
 def create_backup():
     ensure_data_file()
     os.makedirs(BACKUP_DIR, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     dst = os.path.join(BACKUP_DIR, f"expenses_backup_{ts}.csv")
     try:
-        shutil.copy(DATA_FILENAME, dst)
+        _fast_copy(DATA_FILENAME, dst)
         print(f"Backup created: {dst}")
     except Exception as e:
         print("Backup failed:", e)
 
 
 def list_backups() -> List[str]:
-    if not os.path.exists(BACKUP_DIR):
+    # Oldest first, by modification time.
+    try:
+        with os.scandir(BACKUP_DIR) as it:
+            entries = [e for e in it if e.name.endswith(".csv") and not e.name.startswith(".") and e.is_file()]
+    except FileNotFoundError:
         return []
-    files = sorted([f for f in os.listdir(BACKUP_DIR) if f.endswith(".csv")])
-    return files
+    entries.sort(key=lambda e: (e.stat().st_mtime, e.name))
+    return [e.name for e in entries]
 
 
-def restore_backup():
-    backups = list_backups()
+def restore_backup(backups: List[str] = None):
+    global _data_ready
+    if backups is None:
+        backups = list_backups()
     if not backups:
         print("No backups available.")
         return
@@ -158,7 +642,9 @@ def restore_backup():
             print("Invalid selection.")
             return
         src = os.path.join(BACKUP_DIR, backups[idx])
-        shutil.copy(src, DATA_FILENAME)
+        _fast_copy(src, DATA_FILENAME)
+        _data_ready = False
+        _cache["stamp"] = _columns_cache["stamp"] = None
         print("Restore completed.")
     except Exception as e:
         print("Restore failed:", e)
@@ -168,11 +654,16 @@ def restore_backup():
 # Validation
 
 def valid_date(s: str) -> bool:
-    try:
-        datetime.strptime(s, "%Y-%m-%d")
-        return True
-    except Exception:
+    # Fixed YYYY-MM-DD check; much cheaper than strptime's format parsing.
+    if len(s) != 10 or s[4] != "-" or s[7] != "-" or not s.isascii():
+        return False
+    y, m, d = s[:4], s[5:7], s[8:10]
+    if not (y.isdigit() and m.isdigit() and d.isdigit()):
         return False
+    year, month, day = int(y), int(m), int(d)
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    return day <= 28 or day <= calendar.monthrange(year, month)[1]
 
 
 def valid_amount(s: str) -> bool:
@@ -186,44 +677,157 @@ def valid_amount(s: str) -> bool:
 
 # Reporting
 
-def total_expense(expenses: List[Expense]) -> float:
-    return sum(e.amount for e in expenses)
+def _vectorize(cols: dict) -> bool:
+    return len(cols["amount"]) >= VECTORIZE_MIN_ROWS and _optional("numpy") is not None
 
 
-def average_expense(expenses: List[Expense]) -> float:
-    if not expenses:
-        return 0.0
-    return total_expense(expenses) / len(expenses)
+def _group_codes(cols: dict, field: str):
+    # (labels, per-row codes) for "category" or "month"; built on first use
+    # and kept in cols, so repeat reports on the same data skip the encoding.
+    key = field + "_codes"
+    if key not in cols:
+        np = _optional("numpy")
+        if field == "month":
+            values = np.asarray(cols["date"], dtype="U7")  # truncates to YYYY-MM
+        else:
+            values = np.asarray(cols["category"])
+        labels, codes = np.unique(values, return_inverse=True)
+        cols[key] = (labels, codes)
+    return cols[key]
+
+
+def _grouped_bincount(cols: dict, field: str) -> dict:
+    np = _optional("numpy")
+    labels, codes = _group_codes(cols, field)
+    sums = np.bincount(codes, weights=np.asarray(cols["amount"], dtype=np.float64),
+                       minlength=len(labels))
+    return {str(label): float(total) for label, total in zip(labels, sums)}
+
 
+def total_expense(cols: dict) -> float:
+    if _vectorize(cols):
+        np = _optional("numpy")
+        return float(np.asarray(cols["amount"], dtype=np.float64).sum())
+    return math.fsum(cols["amount"])
 
-def category_summary(expenses: List[Expense]) -> dict:
+
+def category_summary(cols: dict) -> dict:
+    if _vectorize(cols):
+        return _grouped_bincount(cols, "category")
     d = defaultdict(float)
-    for e in expenses:
-        d[e.category] += e.amount
+    for cat, amount in zip(cols["category"], cols["amount"]):
+        d[cat] += amount
     return dict(d)
 
 
-def monthly_summary(expenses: List[Expense]) -> dict:
+def monthly_summary(cols: dict) -> dict:
     d = defaultdict(float)
-    for e in expenses:
-        key = e.date[:7]  # YYYY-MM
-        d[key] += e.amount
+    dates, amounts = cols["date"], cols["amount"]
+    if cols.get("dates_sorted"):
+        # Chronological files: each month is one contiguous slice.
+        lo = 0
+        while lo < len(dates):
+            month = dates[lo][:7]
+            if len(month) == 7:
+                hi = bisect_left(dates, month + "\uffff", lo)
+            else:
+                hi = bisect_right(dates, dates[lo], lo)
+            d[month] += math.fsum(amounts[lo:hi])
+            lo = hi
+        return dict(d)
+    if _vectorize(cols):
+        return _grouped_bincount(cols, "month")
+    for date, amount in zip(dates, amounts):
+        d[date[:7]] += amount  # YYYY-MM
     return dict(d)
 
 
 
+# Running Totals
+
+# Kept in a small JSON file next to the CSV so reports don't need a full
+# scan; the stored stamp ties it to one version of the CSV.
+def _totals_path() -> str:
+    return os.path.splitext(DATA_FILENAME)[0] + ".totals.json"
+
+
+def compute_totals(cols: dict) -> dict:
+    return {
+        "total": total_expense(cols),
+        "count": len(cols["amount"]),
+        "by_category": category_summary(cols),
+        "by_month": monthly_summary(cols),
+    }
+
+
+def _totals_of(expenses: List[Expense]) -> dict:
+    cols = {"date": [e.date for e in expenses], "category": [e.category for e in expenses],
+            "amount": [e.amount for e in expenses]}
+    return compute_totals(cols)
+
+
+def _read_totals(stamp):
+    try:
+        with open(_totals_path(), "r", encoding="utf-8") as f:
+            totals = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(totals, dict) or totals.get("stamp") != list(stamp or ()):
+        return None
+    # Anything malformed counts as corrupt and triggers a full rebuild.
+    if not (isinstance(totals.get("total"), (int, float))
+            and isinstance(totals.get("count"), int)
+            and isinstance(totals.get("by_category"), dict)
+            and isinstance(totals.get("by_month"), dict)):
+        return None
+    return totals
+
+
+def _write_totals(totals: dict):
+    totals["stamp"] = list(_file_stamp() or ())
+    try:
+        with open(_totals_path(), "w", encoding="utf-8") as f:
+            json.dump(totals, f, ensure_ascii=False)
+    except OSError as e:
+        print("Could not save totals:", e)
+
+
+def _update_totals(expense: Expense, before):
+    totals = _read_totals(before)
+    if totals is None:
+        return  # stale or missing; load_totals() will rebuild it
+    totals["total"] += expense.amount
+    totals["count"] += 1
+    by_cat, by_month = totals["by_category"], totals["by_month"]
+    by_cat[expense.category] = by_cat.get(expense.category, 0.0) + expense.amount
+    month = expense.date[:7]
+    by_month[month] = by_month.get(month, 0.0) + expense.amount
+    _write_totals(totals)
+
+
+def load_totals() -> dict:
+    ensure_data_file()
+    totals = _read_totals(_file_stamp())
+    if totals is None:
+        totals = compute_totals(load_expenses_columnar())
+        _write_totals(totals)
+    return totals
+
+
+
 # CLI Menu & Flows
 
-def add_expense_flow():
+def add_expense_flow(appender: "BulkAppender" = None):
     print("\nADD NEW EXPENSE")
     while True:
         amt = input("Enter amount: ").strip()
         if valid_amount(amt):
             break
         print("Invalid amount. Enter a non-negative number (e.g., 1500 or 99.50).")
-    print("Categories:", ", ".join(CATEGORIES))
-    cat = input("Enter category (or press Enter for Other): ").strip() or "Other"
-    if cat not in CATEGORIES:
+    print("Categories:", ", ".join(CATEGORIES_TUPLE))
+    entered = input("Enter category (or press Enter for Other): ").strip() or "Other"
+    cat = CATEGORIES_LC.get(entered.lower())
+    if cat is None:
         print("Category not recognized; using 'Other'.")
         cat = "Other"
     while True:
@@ -236,7 +840,10 @@ def add_expense_flow():
         print("Invalid date format. Use YYYY-MM-DD.")
     desc = input("Enter description (optional): ").strip()
     e = Expense(amount=float(amt), category=cat, date=date, description=desc)
-    append_expense(e)
+    if appender is not None:
+        appender.add(e)
+    else:
+        append_expense(e)
     print("✅ Expense added.")
 
 
@@ -245,36 +852,49 @@ def view_all_expenses(expenses: List[Expense]):
         print("\nNo expenses found.")
         return
     print("\nALL EXPENSES:")
-    for i, e in enumerate(expenses, 1):
-        print(f"{i}. {e}")
+    for e in expenses:
+        print(f"{e.id}. {e}")
 
 
-def search_expenses_flow(expenses: List[Expense]):
+def search_columns(cols: dict, q: str) -> List[int]:
+    cat_lc, desc_lc, dates = cols.get("category_lc", []), cols.get("description_lc", []), cols["date"]
+    # Test the column most likely to match first so `or` short-circuits early.
+    if (len(q) >= 4 and q[:4].isdigit()) or "-" in q:
+        first, second, third = dates, cat_lc, desc_lc
+    elif any(q in c for c in CATEGORIES_LC):
+        first, second, third = cat_lc, desc_lc, dates
+    else:
+        first, second, third = desc_lc, cat_lc, dates
+    return [i for i, (a, b, c) in enumerate(zip(first, second, third)) if q in a or q in b or q in c]
+
+
+def search_expenses_flow(cols: dict):
     q = input("Search by category, description, or date (text): ").strip().lower()
     if not q:
         print("Empty query.")
         return
-    results = [e for e in expenses if q in e.category.lower() or q in e.description.lower() or q in e.date]
-    if not results:
+    hits = search_columns(cols, q)
+    if not hits:
         print("No matches found.")
         return
-    print(f"\nFound {len(results)} result(s):")
-    for i, e in enumerate(results, 1):
-        print(f"{i}. {e}")
+    print(f"\nFound {len(hits)} result(s):")
+    for i in hits:
+        e = Expense(cols["amount"][i], cols["category"][i], cols["date"][i], cols["description"][i])
+        print(f"{cols['id'][i]}. {e}")
 
 
 def edit_expense_flow(expenses: List[Expense]):
     view_all_expenses(expenses)
     if not expenses:
         return
-    idx = input("Enter expense number to edit (or press Enter to cancel): ").strip()
+    idx = input("Enter expense id to edit (or press Enter to cancel): ").strip()
     if not idx:
         print("Cancelled.")
         return
     try:
-        i = int(idx) - 1
-        if i < 0 or i >= len(expenses):
-            print("Invalid number.")
+        i = expense_position(expenses, int(idx))
+        if i is None:
+            print("Invalid id.")
             return
     except Exception:
         print("Invalid input.")
@@ -291,7 +911,7 @@ def edit_expense_flow(expenses: List[Expense]):
         else:
             print("Invalid amount; unchanged.")
     if new_cat:
-        e.category = new_cat if new_cat in CATEGORIES else "Other"
+        e.category = CATEGORIES_LC.get(new_cat.lower(), "Other")
     if new_date:
         if valid_date(new_date):
             e.date = new_date
@@ -299,22 +919,22 @@ def edit_expense_flow(expenses: List[Expense]):
             print("Invalid date; unchanged.")
     if new_desc:
         e.description = new_desc
-    save_expenses(expenses)
-    print("Expense updated.")
+    if update_expense(expenses, e):
+        print("Expense updated.")
 
 
 def delete_expense_flow(expenses: List[Expense]):
     view_all_expenses(expenses)
     if not expenses:
         return
-    idx = input("Enter expense number to delete (or press Enter to cancel): ").strip()
+    idx = input("Enter expense id to delete (or press Enter to cancel): ").strip()
     if not idx:
         print("Cancelled.")
         return
     try:
-        i = int(idx) - 1
-        if i < 0 or i >= len(expenses):
-            print("Invalid number.")
+        i = expense_position(expenses, int(idx))
+        if i is None:
+            print("Invalid id.")
             return
     except Exception:
         print("Invalid input.")
@@ -322,21 +942,23 @@ def delete_expense_flow(expenses: List[Expense]):
     confirm = input("Type YES to confirm deletion: ").strip()
     if confirm == "YES":
         removed = expenses.pop(i)
-        save_expenses(expenses)
-        print(f"Deleted: {removed}")
+        _record_last_id(removed.id)  # files from before .lastid existed
+        if save_expenses(expenses):
+            print(f"Deleted: {removed}")
     else:
         print("Deletion cancelled.")
 
 
-def show_reports_flow(expenses: List[Expense]):
+def show_reports_flow(totals: dict):
+    count = totals["count"]
     print("\nREPORTS")
-    print(f"Total expense: ₹{total_expense(expenses):.2f}")
-    print(f"Average expense: ₹{average_expense(expenses):.2f}")
+    print(f"Total expense: ₹{totals['total']:.2f}")
+    print(f"Average expense: ₹{(totals['total'] / count if count else 0.0):.2f}")
     print("\nCategory-wise:")
-    for k, v in sorted(category_summary(expenses).items(), key=lambda x: -x[1]):
+    for k, v in sorted(totals["by_category"].items(), key=lambda x: -x[1]):
         print(f" - {k}: ₹{v:.2f}")
     print("\nMonthly summary:")
-    for k, v in sorted(monthly_summary(expenses).items()):
+    for k, v in sorted(totals["by_month"].items()):
         print(f" - {k}: ₹{v:.2f}")
 
 
@@ -361,12 +983,12 @@ def backup_and_restore_flow():
     print("3. List backups")
     print("4. Cancel")
     choice = input("Enter choice (1-4): ").strip()
+    backups = list_backups() if choice in ("2", "3") else None
     if choice == "1":
         create_backup()
     elif choice == "2":
-        restore_backup()
+        restore_backup(backups)
     elif choice == "3":
-        backups = list_backups()
         if not backups:
             print("No backups.")
         else:
@@ -413,12 +1035,11 @@ def main_menu():
             delete_expense_flow(exps)
             pause()
         elif choice == "5":
-            exps = load_expenses()
-            search_expenses_flow(exps)
+            cols = load_expenses_columnar()
+            search_expenses_flow(cols)
             pause()
         elif choice == "6":
-            exps = load_expenses()
-            show_reports_flow(exps)
+            show_reports_flow(load_totals())
             pause()
         elif choice == "7":
             export_options_flow()